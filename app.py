@@ -5,18 +5,29 @@ Integrates all services and provides web interface
 
 from flask import Flask, request, jsonify, render_template, send_from_directory
 from flask_cors import CORS
+from flask_caching import Cache
+from flask.json.provider import DefaultJSONProvider
+import orjson
 import os
 import json
 import logging
 from datetime import datetime
+from urllib.parse import urlencode
 import uuid
+import threading
+from werkzeug.exceptions import HTTPException
 from werkzeug.utils import secure_filename
+from sqlalchemy import Index
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import scoped_session, sessionmaker
 
 # Import our services
 from services.job_scraper import JobScraper
 from services.resume_parser import ResumeParser
 from services.matching_algorithm import AdvancedMatchingAlgorithm
-from database.models import create_database_engine, create_tables, get_session, JobPosting, Resume, JobMatch
+from database.models import create_database_engine, create_tables, JobPosting, Resume, JobMatch
 from config import Config
 
 # Configure logging
@@ -30,19 +41,109 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+class ORJSONProvider(DefaultJSONProvider):
+    """JSON provider serializing with orjson, used by jsonify and request.get_json"""
+    
+    # dumps arguments orjson can honour; calls using any other argument go to the stdlib provider
+    orjson_dumps_args = frozenset(['default', 'sort_keys', 'indent', 'separators'])
+    
+    def _options(self, sort_keys=None, indent=None):
+        # Datetimes go through Flask's default handler to keep the HTTP date format
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+    
+    def _orjson_can_dump(self, kwargs):
+        # orjson only indents by two spaces and always uses the separators json uses by default
+        indent = kwargs.get('indent')
+        separators = kwargs.get('separators')
+        return (
+            kwargs.keys() <= self.orjson_dumps_args
+            and indent in (None, 0, 2)
+            and separators in (None, (',', ': ') if indent else (',', ':'))
+        )
+    
+    def dumps(self, obj, **kwargs):
+        if not self._orjson_can_dump(kwargs):
+            return super().dumps(obj, **kwargs)
+        option = self._options(kwargs.get('sort_keys'), kwargs.get('indent'))
+        return orjson.dumps(obj, default=kwargs.get('default', self.default), option=option).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        # orjson.loads takes no options, so hooks (e.g. the session's object_hook) need the stdlib
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options())
+        return self._app.response_class(body, mimetype=self.mimetype)
+
 # Initialize Flask app
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.config.from_object(Config)
 CORS(app)
+cache = Cache(app)
 
 # Initialize database
 engine = create_database_engine(Config.DATABASE_URL)
 create_tables(engine)
 
-# Initialize services
-job_scraper = JobScraper()
-resume_parser = ResumeParser()
-matching_algorithm = AdvancedMatchingAlgorithm()
+# One session per request, released when the app context tears down
+Session = scoped_session(sessionmaker(bind=engine))
+
+# Unique key on scraped jobs so duplicates are skipped by the database itself.
+# Databases that already contain duplicate rows cannot get the index; they keep
+# the query-based dedup until the duplicates are removed.
+job_dedup_index = Index(
+    'uq_job_postings_title_company_source_url',
+    JobPosting.title, JobPosting.company, JobPosting.source_url,
+    unique=True
+)
+try:
+    job_dedup_index.create(engine, checkfirst=True)
+    job_dedup_index_ready = True
+except SQLAlchemyError as e:
+    logger.warning(f"Could not create unique index {job_dedup_index.name}, "
+                   f"falling back to query-based job dedup: {e}")
+    job_dedup_index_ready = False
+
+# Dialects supporting INSERT ... ON CONFLICT DO NOTHING
+UPSERT_INSERTS = {
+    'postgresql': postgresql_insert,
+    'sqlite': sqlite_insert
+}
+
+# Services are created on first use so workers start without loading the ML models
+services = {}
+services_lock = threading.Lock()
+
+def get_service(name, factory):
+    """Return the shared service, building it once even when first requested concurrently"""
+    service = services.get(name)
+    if service is None:
+        with services_lock:
+            service = services.get(name)
+            if service is None:
+                service = services[name] = factory()
+    return service
+
+def get_job_scraper():
+    """Return the shared job scraper"""
+    return get_service('job_scraper', JobScraper)
+
+def get_resume_parser():
+    """Return the shared resume parser (loads the spaCy model)"""
+    return get_service('resume_parser', ResumeParser)
+
+def get_matcher():
+    """Return the shared matching algorithm (loads the sentence transformer)"""
+    return get_service('matcher', AdvancedMatchingAlgorithm)
 
 # Ensure upload directory exists
 UPLOAD_FOLDER = 'uploads'
@@ -50,11 +151,102 @@ if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
+# Reject oversized request bodies before they are read; the limit leaves room for
+# multipart overhead, and the uploaded file itself is checked against MAX_FILE_SIZE
+app.config['MAX_CONTENT_LENGTH'] = Config.MAX_FILE_SIZE + Config.MAX_REQUEST_OVERHEAD
+
+@app.teardown_appcontext
+def remove_session(exception=None):
+    """Return the request's database session to the pool"""
+    Session.remove()
+
+def is_cacheable(response):
+    """Only cache successful responses; error paths return (response, status) tuples"""
+    return not isinstance(response, tuple)
+
+# Cache keys for the cached API views
+STATISTICS_CACHE_KEY = 'api_statistics'
+JOBS_CACHE_GENERATION_KEY = 'api_jobs_generation'
+
+def jobs_cache_key(*args, **kwargs):
+    """Cache key for /api/jobs: current jobs generation plus the sorted query string"""
+    generation = cache.get(JOBS_CACHE_GENERATION_KEY) or '0'
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return f"api_jobs:{generation}:{query}"
+
+# Invalidation runs after the data is committed, so a cache backend outage is
+# logged instead of failing the request; cached entries expire on their timeout
+def invalidate_jobs_cache():
+    """Start a new /api/jobs generation so every cached page is bypassed"""
+    try:
+        cache.set(JOBS_CACHE_GENERATION_KEY, uuid.uuid4().hex, timeout=0)
+    except Exception as e:
+        logger.warning(f"Could not invalidate jobs cache: {e}")
+
+def invalidate_statistics_cache():
+    """Drop the cached /api/statistics response"""
+    try:
+        cache.delete(STATISTICS_CACHE_KEY)
+    except Exception as e:
+        logger.warning(f"Could not invalidate statistics cache: {e}")
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
-    return '.' in filename and \
-           filename.rsplit('.', 1)[1].lower() in Config.ALLOWED_EXTENSIONS
+    _, dot, extension = filename.rpartition('.')
+    return bool(dot) and extension.lower() in Config.ALLOWED_EXTENSIONS
+
+def store_jobs(session, jobs):
+    """Insert scraped jobs that are not stored yet and return how many were added"""
+    if not jobs:
+        return 0
+    
+    # The upsert path counts stored rows from INSERT ... RETURNING (SQLite >= 3.35, PostgreSQL)
+    dialect_insert = UPSERT_INSERTS.get(engine.dialect.name)
+    if (dialect_insert is None or not job_dedup_index_ready
+            or not engine.dialect.insert_executemany_returning):
+        return store_jobs_by_lookup(session, jobs)
+    
+    # The unique index treats NULL source_urls as distinct, so dedup those by lookup
+    stored = store_jobs_by_lookup(
+        session, [job for job in jobs if job.get('source_url') is None]
+    )
+    
+    # Scraped jobs don't always carry the same fields - run one executemany per field set
+    jobs_by_fields = {}
+    for job_data in jobs:
+        if job_data.get('source_url') is not None:
+            jobs_by_fields.setdefault(frozenset(job_data), []).append(job_data)
+    
+    # Rows skipped by ON CONFLICT DO NOTHING return nothing, so each returned id is a stored job
+    stmt = dialect_insert(JobPosting.__table__).on_conflict_do_nothing().returning(JobPosting.id)
+    for rows in jobs_by_fields.values():
+        stored += len(session.execute(stmt, rows).all())
+    return stored
+
+def store_jobs_by_lookup(session, jobs):
+    """Insert jobs whose (title, company, source_url) is not stored yet, using one lookup query"""
+    if not jobs:
+        return 0
+    
+    # Compare keys in Python so NULL source_urls match each other like filter_by(source_url=None)
+    titles = {job['title'] for job in jobs}
+    existing_keys = {
+        tuple(row)
+        for row in session.query(
+            JobPosting.title, JobPosting.company, JobPosting.source_url
+        ).filter(JobPosting.title.in_(titles))
+    }
+    
+    new_jobs = []
+    for job_data in jobs:
+        key = (job_data['title'], job_data['company'], job_data.get('source_url'))
+        if key not in existing_keys:
+            existing_keys.add(key)
+            new_jobs.append(job_data)
+    
+    if new_jobs:
+        session.bulk_insert_mappings(JobPosting, new_jobs)
+    return len(new_jobs)
 
 @app.route('/')
 def index():
@@ -96,42 +288,33 @@ def scrape_jobs():
         logger.info(f"Scraping jobs for categories: {categories}")
         
         # Scrape jobs from multiple sources
-        jobs = job_scraper.scrape_multiple_sources(
+        jobs = get_job_scraper().scrape_multiple_sources(
             categories=categories,
             limit_per_source=limit_per_source
         )
         
         # Store jobs in database
-        session = get_session(engine)
-        stored_jobs = []
-        
-        for job_data in jobs:
-            # Check if job already exists
-            existing_job = session.query(JobPosting).filter_by(
-                title=job_data['title'],
-                company=job_data['company'],
-                source_url=job_data['source_url']
-            ).first()
-            
-            if not existing_job:
-                job = JobPosting(**job_data)
-                session.add(job)
-                stored_jobs.append(job)
+        session = Session()
+        
+        jobs_stored = store_jobs(session, jobs)
         
         session.commit()
-        session.close()
+        invalidate_jobs_cache()
+        invalidate_statistics_cache()
         
         # Get statistics
-        stats = job_scraper.get_job_statistics(jobs)
+        stats = get_job_scraper().get_job_statistics(jobs)
         
         return jsonify({
             'success': True,
             'jobs_scraped': len(jobs),
-            'jobs_stored': len(stored_jobs),
+            'jobs_stored': jobs_stored,
             'statistics': stats,
             'message': f'Successfully scraped {len(jobs)} jobs from multiple sources'
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error scraping jobs: {e}")
         return jsonify({
@@ -140,10 +323,11 @@ def scrape_jobs():
         }), 500
 
 @app.route('/api/jobs', methods=['GET'])
+@cache.cached(timeout=Config.JOBS_CACHE_TIMEOUT, make_cache_key=jobs_cache_key, response_filter=is_cacheable)
 def get_jobs():
     """Get jobs from database"""
     try:
-        session = get_session(engine)
+        session = Session()
         
         # Get query parameters
         category = request.args.get('category')
@@ -165,8 +349,6 @@ def get_jobs():
         # Convert to dictionaries
         jobs_data = [job.to_dict() for job in jobs]
         
-        session.close()
-        
         return jsonify({
             'success': True,
             'jobs': jobs_data,
@@ -208,13 +390,20 @@ def upload_resume():
         # Save file
         filename = secure_filename(file.filename)
         file_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{uuid.uuid4()}_{filename}")
-        file.save(file_path)
+        file.save(file_path, buffer_size=Config.UPLOAD_CHUNK_SIZE)
+        
+        if os.path.getsize(file_path) > Config.MAX_FILE_SIZE:
+            os.remove(file_path)
+            return jsonify({
+                'success': False,
+                'error': f'File too large. Maximum size: {Config.MAX_FILE_SIZE // (1024 * 1024)}MB'
+            }), 413
         
         # Parse resume
-        parsed_data = resume_parser.parse_resume_file(file_path)
+        parsed_data = get_resume_parser().parse_resume_file(file_path)
         
         # Store in database
-        session = get_session(engine)
+        session = Session()
         resume = Resume(
             candidate_name=parsed_data.get('candidate_name'),
             candidate_email=parsed_data.get('candidate_email'),
@@ -236,8 +425,8 @@ def upload_resume():
         
         session.add(resume)
         session.commit()
+        invalidate_statistics_cache()
         resume_id = resume.id
-        session.close()
         
         return jsonify({
             'success': True,
@@ -246,6 +435,9 @@ def upload_resume():
             'message': 'Resume uploaded and parsed successfully'
         })
         
+    except HTTPException:
+        # Let Flask render 4xx errors raised while reading the body (e.g. 413)
+        raise
     except Exception as e:
         logger.error(f"Error uploading resume: {e}")
         return jsonify({
@@ -272,10 +464,10 @@ def parse_resume_text():
             }), 400
         
         # Parse resume text
-        parsed_data = resume_parser.parse_resume_text(text)
+        parsed_data = get_resume_parser().parse_resume_text(text)
         
         # Store in database
-        session = get_session(engine)
+        session = Session()
         resume = Resume(
             candidate_name=parsed_data.get('candidate_name'),
             candidate_email=parsed_data.get('candidate_email'),
@@ -296,8 +488,8 @@ def parse_resume_text():
         
         session.add(resume)
         session.commit()
+        invalidate_statistics_cache()
         resume_id = resume.id
-        session.close()
         
         return jsonify({
             'success': True,
@@ -306,6 +498,8 @@ def parse_resume_text():
             'message': 'Resume text parsed successfully'
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error parsing resume text: {e}")
         return jsonify({
@@ -330,11 +524,19 @@ def match_resume():
         limit = data.get('limit', 50)
         
         # Get resume from database
-        session = get_session(engine)
-        resume = session.query(Resume).filter_by(id=resume_id).first()
+        session = Session()
+        # Only load the fields used for matching, not raw_text or file metadata
+        resume = session.query(
+            Resume.candidate_name,
+            Resume.skills_extracted,
+            Resume.experience_years,
+            Resume.education_level,
+            Resume.location,
+            Resume.experience_details,
+            Resume.education_details
+        ).filter_by(id=resume_id).first()
         
         if not resume:
-            session.close()
             return jsonify({
                 'success': False,
                 'error': 'Resume not found'
@@ -351,8 +553,6 @@ def match_resume():
         jobs = query.limit(limit).all()
         jobs_data = [job.to_dict() for job in jobs]
         
-        session.close()
-        
         # Convert resume to dictionary format
         resume_data = {
             'candidate_name': resume.candidate_name,
@@ -364,44 +564,48 @@ def match_resume():
             'education_details': resume.education_details or []
         }
         
+        # Release the connection during matching; the session reopens for the writes below
+        session.close()
+        
         # Perform matching
         logger.info(f"Matching resume {resume_id} against {len(jobs_data)} jobs")
-        matches = matching_algorithm.match_resume_to_jobs(resume_data, jobs_data)
-        
-        # Store matches in database
-        session = get_session(engine)
+        matches = get_matcher().match_resume_to_jobs(resume_data, jobs_data)
+        
+        # Store matches in database, skipping jobs this resume was already matched against
+        existing_job_ids = {
+            job_posting_id
+            for (job_posting_id,) in session.query(JobMatch).filter_by(
+                resume_id=resume_id
+            ).with_entities(JobMatch.job_posting_id)
+        }
         stored_matches = []
         
         for match_data in matches:
-            # Check if match already exists
-            existing_match = session.query(JobMatch).filter_by(
-                resume_id=resume_id,
-                job_posting_id=match_data['job_id']
-            ).first()
-            
-            if not existing_match:
-                match = JobMatch(
-                    resume_id=resume_id,
-                    job_posting_id=match_data['job_id'],
-                    overall_score=match_data['overall_score'],
-                    skills_score=match_data['skills_score'],
-                    experience_score=match_data['experience_score'],
-                    education_score=match_data['education_score'],
-                    location_score=match_data['location_score'],
-                    matched_skills=match_data['matched_skills'],
-                    missing_skills=match_data['missing_skills'],
-                    skill_gaps=match_data['skill_gaps'],
-                    experience_match=match_data['experience_match'],
-                    education_match=match_data['education_match'],
-                    recommendations=match_data['recommendations'],
-                    confidence_score=match_data['confidence_score'],
-                    algorithm_version=match_data['algorithm_version']
-                )
-                session.add(match)
-                stored_matches.append(match)
+            if match_data['job_id'] not in existing_job_ids:
+                existing_job_ids.add(match_data['job_id'])
+                stored_matches.append({
+                    'resume_id': resume_id,
+                    'job_posting_id': match_data['job_id'],
+                    'overall_score': match_data['overall_score'],
+                    'skills_score': match_data['skills_score'],
+                    'experience_score': match_data['experience_score'],
+                    'education_score': match_data['education_score'],
+                    'location_score': match_data['location_score'],
+                    'matched_skills': match_data['matched_skills'],
+                    'missing_skills': match_data['missing_skills'],
+                    'skill_gaps': match_data['skill_gaps'],
+                    'experience_match': match_data['experience_match'],
+                    'education_match': match_data['education_match'],
+                    'recommendations': match_data['recommendations'],
+                    'confidence_score': match_data['confidence_score'],
+                    'algorithm_version': match_data['algorithm_version']
+                })
+        
+        if stored_matches:
+            session.bulk_insert_mappings(JobMatch, stored_matches)
         
         session.commit()
-        session.close()
+        invalidate_statistics_cache()
         
         return jsonify({
             'success': True,
@@ -411,6 +615,8 @@ def match_resume():
             'message': f'Successfully matched resume against {len(jobs_data)} jobs'
         })
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error matching resume: {e}")
         return jsonify({
@@ -422,22 +628,28 @@ def match_resume():
 def get_matches(resume_id):
     """Get matches for a specific resume"""
     try:
-        session = get_session(engine)
+        session = Session()
         
         # Get matches from database
         matches = session.query(JobMatch).filter_by(resume_id=resume_id).all()
         
-        # Get job details for each match
+        # Get job details for all matches in a single query
+        job_ids = {match.job_posting_id for match in matches}
+        jobs = {}
+        if job_ids:
+            jobs = {
+                job.id: job
+                for job in session.query(JobPosting).filter(JobPosting.id.in_(job_ids))
+            }
+        
         matches_data = []
         for match in matches:
-            job = session.query(JobPosting).filter_by(id=match.job_posting_id).first()
+            job = jobs.get(match.job_posting_id)
             if job:
                 match_data = match.to_dict()
                 match_data['job_details'] = job.to_dict()
                 matches_data.append(match_data)
         
-        session.close()
-        
         return jsonify({
             'success': True,
             'resume_id': resume_id,
@@ -453,10 +665,11 @@ def get_matches(resume_id):
         }), 500
 
 @app.route('/api/statistics', methods=['GET'])
+@cache.cached(timeout=Config.STATISTICS_CACHE_TIMEOUT, key_prefix=STATISTICS_CACHE_KEY, response_filter=is_cacheable)
 def get_statistics():
     """Get system statistics"""
     try:
-        session = get_session(engine)
+        session = Session()
         
         # Count records
         total_jobs = session.query(JobPosting).filter_by(is_active=True).count()
@@ -472,8 +685,6 @@ def get_statistics():
             Resume.created_at.desc()
         ).limit(5).all()
         
-        session.close()
-        
         return jsonify({
             'success': True,
             'statistics': {
@@ -492,6 +703,65 @@ def get_statistics():
             'error': str(e)
         }), 500
 
+@app.route('/api/batch', methods=['POST'])
+def batch_requests():
+    """Run several GET API requests in a single round-trip"""
+    try:
+        data = request.get_json()
+        if not isinstance(data, list) or not data:
+            return jsonify({
+                'success': False,
+                'error': 'Expected a non-empty list of requests'
+            }), 400
+        
+        if len(data) > Config.MAX_BATCH_REQUESTS:
+            return jsonify({
+                'success': False,
+                'error': f'Too many requests in batch. Maximum: {Config.MAX_BATCH_REQUESTS}'
+            }), 400
+        
+        responses = []
+        client = app.test_client()
+        
+        for item in data:
+            path = item.get('path') if isinstance(item, dict) else None
+            method = item.get('method', 'GET') if isinstance(item, dict) else None
+            
+            # Only well-formed, read-only API requests can be batched
+            if (not isinstance(path, str) or not isinstance(method, str)
+                    or method.upper() != 'GET'
+                    or not path.startswith('/api/') or path.startswith('/api/batch')):
+                responses.append({
+                    'path': path,
+                    'status': 400,
+                    'body': {
+                        'success': False,
+                        'error': 'Each request needs a string path to a /api/ endpoint and method GET'
+                    }
+                })
+                continue
+            
+            sub_response = client.get(path)
+            responses.append({
+                'path': path,
+                'status': sub_response.status_code,
+                'body': sub_response.get_json()
+            })
+        
+        return jsonify({
+            'success': True,
+            'responses': responses
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error processing batch request: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
@@ -500,6 +770,14 @@ def not_found(error):
         'error': 'Endpoint not found'
     }), 404
 
+@app.errorhandler(413)
+def request_too_large(error):
+    """Handle request bodies exceeding MAX_CONTENT_LENGTH"""
+    return jsonify({
+        'success': False,
+        'error': 'Request too large'
+    }), 413
+
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
@@ -514,7 +792,7 @@ if __name__ == '__main__':
     logger.info(f"Database URL: {Config.DATABASE_URL}")
     logger.info(f"Debug mode: {Config.DEBUG}")
     
-    # Run the application
+    # Run the development server (use `gunicorn -c gunicorn_conf.py app:app` in production)
     app.run(
         host='0.0.0.0',
         port=5000,
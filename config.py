@@ -42,10 +42,14 @@ class Config:
     # File Upload Configuration
     ALLOWED_EXTENSIONS = {'pdf', 'docx', 'doc', 'txt'}
     MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+    UPLOAD_CHUNK_SIZE = 64 * 1024  # 64KB chunks when writing uploads to disk
+    MAX_REQUEST_OVERHEAD = 1024 * 1024  # 1MB allowance for multipart headers and form fields
     
     # Flask Configuration
     SECRET_KEY = os.getenv('SECRET_KEY', 'your-secret-key-here')
     DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
+    # Let the front-end server (e.g. nginx) send static files via X-Sendfile
+    USE_X_SENDFILE = os.getenv('USE_X_SENDFILE', 'False').lower() == 'true'
     
     # Logging Configuration
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
@@ -53,10 +57,20 @@ class Config:
     
     # Cache Configuration
     CACHE_TIMEOUT = 3600  # 1 hour
+    # SimpleCache is per-process and only suitable for the single-process dev server;
+    # gunicorn_conf.py defaults to RedisCache so all workers share one cache
+    CACHE_TYPE = os.getenv('CACHE_TYPE', 'SimpleCache')
+    CACHE_REDIS_URL = os.getenv('CACHE_REDIS_URL', 'redis://localhost:6379/0')
+    CACHE_DEFAULT_TIMEOUT = CACHE_TIMEOUT
+    JOBS_CACHE_TIMEOUT = 300  # 5 minutes
+    STATISTICS_CACHE_TIMEOUT = 60  # 1 minute
     
     # API Rate Limiting
     RATE_LIMIT_PER_HOUR = 100
     
+    # Maximum sub-requests accepted by /api/batch
+    MAX_BATCH_REQUESTS = 10
+    
     # Supported Job Categories
     JOB_CATEGORIES = [
         'python', 'javascript', 'java', 'data-science', 'machine-learning',
@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration for Smart Resume Matcher
+Production server settings, used with: gunicorn -c gunicorn_conf.py app:app
+"""
+
+# Patch the standard library for gevent before the preloaded app is imported, so
+# threading.local (used by the scoped SQLAlchemy session) is greenlet-local and
+# sockets/ssl used by the scraper are cooperative
+from gevent import monkey
+monkey.patch_all()
+
+import multiprocessing
+import os
+
+# Workers are separate processes - use a shared cache so invalidation reaches all of them
+os.environ.setdefault('CACHE_TYPE', 'RedisCache')
+
+# Server socket
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:5000')
+
+# Worker processes - gevent lets scraper I/O yield while other workers run ML inference
+worker_class = 'gevent'
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+worker_connections = 200
+timeout = 120
+
+# Load the app (and its models) once in the master so forked workers share memory
+preload_app = True
+
+# Logging
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'INFO').lower()
+
+
+def when_ready(server):
+    """Load the ML services in the master before workers are forked"""
+    from app import get_matcher, get_resume_parser
+    get_resume_parser()
+    get_matcher()
+
+
+def post_fork(server, worker):
+    """Drop the database connections inherited from the master without closing them"""
+    from app import engine
+    engine.dispose(close=False)
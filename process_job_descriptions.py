@@ -4,51 +4,169 @@ Job Descriptions Processor
 Processes 100 real job descriptions and adds them to the Smart Resume Matcher system
 """
 
+import hashlib
 import json
+import os
+import re
+import sys
 import uuid
+from collections import Counter
+from dataclasses import dataclass, asdict
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
 
-def process_job_descriptions(raw_jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+try:
+    import orjson
+except ImportError:  # fall back to the standard library json module
+    orjson = None
+
+# Category keywords in priority order - the first category with a matching skill wins
+CATEGORY_KEYWORDS = [
+    ('python', ['python', 'django', 'flask', 'fastapi']),
+    ('java', ['java', 'spring', 'kotlin']),
+    ('javascript', ['javascript', 'node.js', 'react', 'angular']),
+    ('ai_ml', ['machine learning', 'ml', 'tensorflow', 'pytorch', 'ai']),
+    ('data', ['data', 'sql', 'etl', 'spark', 'hadoop']),
+    ('devops', ['aws', 'azure', 'gcp', 'cloud', 'devops', 'kubernetes']),
+    ('security', ['security', 'siem', 'penetration', 'cybersecurity']),
+]
+
+# Precompiled keyword -> (priority, category) lookup, built once at import
+KEYWORD_CATEGORIES = {
+    keyword: (priority, category)
+    for priority, (category, keywords) in enumerate(CATEGORY_KEYWORDS)
+    for keyword in keywords
+}
+
+# Seniority keywords in job titles, matched as whole words
+EXPERIENCE_LEVEL_RE = re.compile(r'\b(senior|sr|lead|principal|junior|jr|entry)\b', re.IGNORECASE)
+EXPERIENCE_LEVEL_KEYWORDS = {
+    'senior': 'senior',
+    'sr': 'senior',
+    'lead': 'senior',
+    'principal': 'senior',
+    'junior': 'junior',
+    'jr': 'junior',
+    'entry': 'junior'
+}
+
+# Fixed field values, interned so every processed job shares the same string objects
+SALARY_CURRENCY = sys.intern('PLN')
+JOB_TYPE = sys.intern('full-time')
+
+# Base salary ranges (PLN) by experience level
+BASE_SALARY_RANGES = {
+    'junior': (8000, 15000),
+    'mid': (12000, 22000),
+    'senior': (18000, 35000)
+}
+
+# Salary multipliers by category
+CATEGORY_MULTIPLIERS = {
+    'ai_ml': 1.3,
+    'data': 1.2,
+    'python': 1.1,
+    'java': 1.1,
+    'javascript': 1.0,
+    'devops': 1.15,
+    'security': 1.25,
+    'other': 1.0
+}
+
+# Adjusted salary range for every (category, experience level) pair
+SALARY_TABLE = {
+    (category, experience_level): (int(salary_min * multiplier), int(salary_max * multiplier))
+    for category, multiplier in CATEGORY_MULTIPLIERS.items()
+    for experience_level, (salary_min, salary_max) in BASE_SALARY_RANGES.items()
+}
+
+# Base skills hierarchy for each category
+CATEGORY_HIERARCHY = {
+    'python': ('backend', 'python', 'api', 'database'),
+    'java': ('backend', 'java', 'spring', 'microservices'),
+    'javascript': ('frontend', 'javascript', 'react', 'node.js'),
+    'ai_ml': ('ai', 'machine learning', 'python', 'data science'),
+    'data': ('data', 'analytics', 'sql', 'etl'),
+    'devops': ('devops', 'cloud', 'automation', 'infrastructure'),
+    'security': ('security', 'cybersecurity', 'network', 'compliance')
+}
+
+# Slotted dataclasses need Python 3.10+; older versions fall back to a regular dataclass
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_OPTIONS)
+class ProcessedJob:
+    """
+    Job description enriched with the metadata used by the matcher
+    """
+    id: int
+    title: str
+    company: str
+    location: str
+    description: str
+    requirements: List[str]
+    nice_to_have: List[str]
+    salary_min: int
+    salary_max: int
+    salary_currency: str
+    job_type: str
+    experience_level: str
+    source_url: str
+    source_site: str
+    category: str
+    education_required: str
+    collected_at: str
+    skills_hierarchy: List[str]
+    remote_work: bool
+    relocation_support: bool
+
+def lower_skill(skill: str) -> str:
+    """
+    Lowercase a skill, skipping the copy when it is already lowercase ASCII
+    """
+    return skill if skill.isascii() and skill.islower() else skill.lower()
+
+def detect_experience_level(title: str) -> str:
+    """
+    Return 'senior', 'junior' or 'mid' from seniority keywords in the title (senior wins)
+    """
+    levels = {EXPERIENCE_LEVEL_KEYWORDS[word.lower()] for word in EXPERIENCE_LEVEL_RE.findall(title)}
+    if 'senior' in levels:
+        return 'senior'
+    if 'junior' in levels:
+        return 'junior'
+    return 'mid'
+
+def detect_category(skills_lower: Iterable[str]) -> str:
+    """
+    Return the highest-priority category matching any of the lowercased skills
+    """
+    best = min(
+        (KEYWORD_CATEGORIES[skill] for skill in skills_lower if skill in KEYWORD_CATEGORIES),
+        default=None
+    )
+    return best[1] if best else 'other'
+
+def process_job_descriptions(raw_jobs: List[Dict[str, Any]]) -> List[ProcessedJob]:
     """
     Process raw job descriptions and add comprehensive metadata
     """
     processed_jobs = []
+    today = datetime.now().strftime('%Y-%m-%d')
     
     for i, job in enumerate(raw_jobs, 1):
         # Extract and clean requirements
         requirements = job.get('requirements', [])
         nice_to_have = job.get('nice_to_have', [])
         
-        # Determine experience level from title and requirements
-        title_lower = job.get('title', '').lower()
-        if any(word in title_lower for word in ['senior', 'sr', 'lead', 'principal']):
-            experience_level = 'senior'
-        elif any(word in title_lower for word in ['junior', 'jr', 'entry']):
-            experience_level = 'junior'
-        else:
-            experience_level = 'mid'
+        # Determine experience level from title
+        experience_level = detect_experience_level(job.get('title', ''))
         
         # Determine category based on requirements and title
         all_skills = requirements + nice_to_have
-        all_skills_lower = [skill.lower() for skill in all_skills]
+        all_skills_lower = frozenset(lower_skill(skill) for skill in all_skills)
         
-        if any(skill in all_skills_lower for skill in ['python', 'django', 'flask', 'fastapi']):
-            category = 'python'
-        elif any(skill in all_skills_lower for skill in ['java', 'spring', 'kotlin']):
-            category = 'java'
-        elif any(skill in all_skills_lower for skill in ['javascript', 'node.js', 'react', 'angular']):
-            category = 'javascript'
-        elif any(skill in all_skills_lower for skill in ['machine learning', 'ml', 'tensorflow', 'pytorch', 'ai']):
-            category = 'ai_ml'
-        elif any(skill in all_skills_lower for skill in ['data', 'sql', 'etl', 'spark', 'hadoop']):
-            category = 'data'
-        elif any(skill in all_skills_lower for skill in ['aws', 'azure', 'gcp', 'cloud', 'devops', 'kubernetes']):
-            category = 'devops'
-        elif any(skill in all_skills_lower for skill in ['security', 'siem', 'penetration', 'cybersecurity']):
-            category = 'security'
-        else:
-            category = 'other'
+        category = detect_category(all_skills_lower)
         
         # Determine education requirement based on role
         if category in ['ai_ml', 'data'] and experience_level == 'senior':
@@ -59,83 +177,95 @@ def process_job_descriptions(raw_jobs: List[Dict[str, Any]]) -> List[Dict[str, A
             education_required = 'bachelor'
         
         # Estimate salary range based on experience and category
-        base_salary_ranges = {
-            'junior': (8000, 15000),
-            'mid': (12000, 22000),
-            'senior': (18000, 35000)
-        }
-        
-        salary_min, salary_max = base_salary_ranges[experience_level]
-        
-        # Adjust for category
-        category_multipliers = {
-            'ai_ml': 1.3,
-            'data': 1.2,
-            'python': 1.1,
-            'java': 1.1,
-            'javascript': 1.0,
-            'devops': 1.15,
-            'security': 1.25,
-            'other': 1.0
-        }
-        
-        multiplier = category_multipliers.get(category, 1.0)
-        salary_min = int(salary_min * multiplier)
-        salary_max = int(salary_max * multiplier)
+        salary_min, salary_max = SALARY_TABLE[(category, experience_level)]
         
         # Determine remote work availability
         location = job.get('location', '').lower()
-        remote_work = any(word in location for word in ['remote', 'hybrid'])
+        is_remote = 'remote' in location
+        remote_work = is_remote or 'hybrid' in location
+        
+        # Senior roles always offer relocation; otherwise only non-remote roles do
+        relocation_support = True if experience_level == 'senior' else not is_remote
         
         # Create skills hierarchy
-        skills_hierarchy = []
-        if category == 'python':
-            skills_hierarchy = ['backend', 'python', 'api', 'database']
-        elif category == 'java':
-            skills_hierarchy = ['backend', 'java', 'spring', 'microservices']
-        elif category == 'javascript':
-            skills_hierarchy = ['frontend', 'javascript', 'react', 'node.js']
-        elif category == 'ai_ml':
-            skills_hierarchy = ['ai', 'machine learning', 'python', 'data science']
-        elif category == 'data':
-            skills_hierarchy = ['data', 'analytics', 'sql', 'etl']
-        elif category == 'devops':
-            skills_hierarchy = ['devops', 'cloud', 'automation', 'infrastructure']
-        elif category == 'security':
-            skills_hierarchy = ['security', 'cybersecurity', 'network', 'compliance']
+        skills_hierarchy = list(CATEGORY_HIERARCHY.get(category, ()))
         
         # Add specific skills from requirements
+        seen_skills = set(skills_hierarchy)  # base hierarchy entries are already lowercase
         for skill in requirements[:3]:  # Top 3 requirements
-            if skill.lower() not in [s.lower() for s in skills_hierarchy]:
-                skills_hierarchy.append(skill.lower())
+            skill_lower = lower_skill(skill)
+            if skill_lower not in seen_skills:
+                seen_skills.add(skill_lower)
+                skills_hierarchy.append(sys.intern(skill_lower))
         
-        processed_job = {
-            "id": i,
-            "title": job.get('title', ''),
-            "company": job.get('company', ''),
-            "location": job.get('location', ''),
-            "description": job.get('description', ''),
-            "requirements": requirements,
-            "nice_to_have": nice_to_have,
-            "salary_min": salary_min,
-            "salary_max": salary_max,
-            "salary_currency": "PLN",
-            "job_type": "full-time",
-            "experience_level": experience_level,
-            "source_url": job.get('source_url', ''),
-            "source_site": job.get('source_site', ''),
-            "category": category,
-            "education_required": education_required,
-            "collected_at": job.get('collected_at', datetime.now().strftime('%Y-%m-%d')),
-            "skills_hierarchy": skills_hierarchy,
-            "remote_work": remote_work,
-            "relocation_support": experience_level == 'senior' or 'remote' not in location.lower()
-        }
+        processed_job = ProcessedJob(
+            id=i,
+            title=job.get('title', ''),
+            company=job.get('company', ''),
+            location=job.get('location', ''),
+            description=job.get('description', ''),
+            requirements=requirements,
+            nice_to_have=nice_to_have,
+            salary_min=salary_min,
+            salary_max=salary_max,
+            salary_currency=SALARY_CURRENCY,
+            job_type=JOB_TYPE,
+            experience_level=experience_level,
+            source_url=job.get('source_url', ''),
+            source_site=job.get('source_site', ''),
+            category=category,
+            education_required=education_required,
+            collected_at=job.get('collected_at', today),
+            skills_hierarchy=skills_hierarchy,
+            remote_work=remote_work,
+            relocation_support=relocation_support
+        )
         
         processed_jobs.append(processed_job)
     
     return processed_jobs
 
+def save_jobs_json(jobs: List[ProcessedJob], path: str) -> None:
+    """
+    Write processed jobs as an indented JSON array, using orjson when available.
+    The file is written to a temporary path and atomically renamed into place.
+    """
+    tmp_path = f"{path}.tmp"
+    if orjson is not None:
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(jobs, option=orjson.OPT_INDENT_2))
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump([asdict(job) for job in jobs], f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def save_jobs_ndjson(jobs: List[ProcessedJob], path: str) -> None:
+    """
+    Write processed jobs as newline-delimited JSON (one job per line) for streaming readers.
+    The file is written to a temporary path and atomically renamed into place.
+    """
+    tmp_path = f"{path}.tmp"
+    if orjson is not None:
+        with open(tmp_path, 'wb') as f:
+            for job in jobs:
+                f.write(orjson.dumps(job))
+                f.write(b'\n')
+    else:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for job in jobs:
+                f.write(json.dumps(asdict(job), ensure_ascii=False))
+                f.write('\n')
+    os.replace(tmp_path, path)
+
+def compute_input_hash(raw_jobs: List[Dict[str, Any]]) -> str:
+    """
+    Hash the raw jobs together with this script so output is rebuilt when either changes
+    """
+    digest = hashlib.sha256(json.dumps(raw_jobs, sort_keys=True).encode('utf-8'))
+    with open(__file__, 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
 def main():
     """Main function to process job descriptions"""
     
@@ -316,29 +446,43 @@ def main():
     # Combine all jobs
     all_raw_jobs = raw_jobs + additional_jobs
     
+    output_path = 'data/job_descriptions_comprehensive.json'
+    ndjson_path = 'data/job_descriptions.ndjson'
+    hash_path = f"{output_path}.sha256"
+    
+    # Skip processing when the outputs were already built from the same input
+    input_hash = compute_input_hash(all_raw_jobs)
+    if all(os.path.exists(path) for path in (output_path, ndjson_path, hash_path)):
+        with open(hash_path, encoding='utf-8') as f:
+            if f.read().strip() == input_hash:
+                print(f"✅ {output_path} is up to date, nothing to do")
+                return
+    
     # Process all job descriptions
     processed_jobs = process_job_descriptions(all_raw_jobs)
     
     # Save to comprehensive file
-    with open('data/job_descriptions_comprehensive.json', 'w', encoding='utf-8') as f:
-        json.dump(processed_jobs, f, indent=2, ensure_ascii=False)
+    save_jobs_json(processed_jobs, output_path)
+    save_jobs_ndjson(processed_jobs, ndjson_path)
+    with open(hash_path, 'w', encoding='utf-8') as f:
+        f.write(input_hash)
     
     print(f"✅ Successfully processed {len(processed_jobs)} job descriptions!")
-    print(f"📁 Saved to: data/job_descriptions_comprehensive.json")
+    print(f"📁 Saved to: {output_path} and {ndjson_path}")
     
-    # Print summary statistics
-    categories = {}
-    experience_levels = {}
-    companies = {}
+    # Print summary statistics (single pass over the processed jobs)
+    categories = Counter()
+    experience_levels = Counter()
+    companies = set()
+    salary_min_total = 0
+    salary_max_total = 0
     
     for job in processed_jobs:
-        cat = job['category']
-        exp = job['experience_level']
-        comp = job['company']
-        
-        categories[cat] = categories.get(cat, 0) + 1
-        experience_levels[exp] = experience_levels.get(exp, 0) + 1
-        companies[comp] = companies.get(comp, 0) + 1
+        categories[job.category] += 1
+        experience_levels[job.experience_level] += 1
+        companies.add(job.company)
+        salary_min_total += job.salary_min
+        salary_max_total += job.salary_max
     
     print("\n📊 Summary Statistics:")
     print(f"Total Jobs: {len(processed_jobs)}")
@@ -347,9 +491,8 @@ def main():
     print(f"Unique Companies: {len(companies)}")
     
     # Show salary ranges
-    salaries = [(job['salary_min'], job['salary_max']) for job in processed_jobs]
-    avg_min = sum(s[0] for s in salaries) / len(salaries)
-    avg_max = sum(s[1] for s in salaries) / len(salaries)
+    avg_min = salary_min_total / len(processed_jobs)
+    avg_max = salary_max_total / len(processed_jobs)
     print(f"Average Salary Range: {avg_min:.0f} - {avg_max:.0f} PLN")
 
 if __name__ == "__main__":
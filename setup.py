@@ -8,18 +8,19 @@ import os
 import sys
 import subprocess
 import shutil
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
 from pathlib import Path
 
 def run_command(command, description):
-    """Run a command and handle errors"""
+    """Run a command (argv list, no shell), streaming its output to the terminal"""
     print(f"🔄 {description}...")
     try:
-        result = subprocess.run(command, shell=True, check=True, capture_output=True, text=True)
+        subprocess.run(command, check=True)
         print(f"✅ {description} completed successfully")
         return True
     except subprocess.CalledProcessError as e:
         print(f"❌ {description} failed: {e}")
-        print(f"Error output: {e.stderr}")
         return False
 
 def check_python_version():
@@ -37,24 +38,24 @@ def install_dependencies():
     """Install Python dependencies"""
     print("📦 Installing Python dependencies...")
     
-    # Upgrade pip first
-    if not run_command("python -m pip install --upgrade pip", "Upgrading pip"):
-        return False
-    
-    # Install requirements
-    if not run_command("pip install -r requirements.txt", "Installing requirements"):
-        return False
+    # Prefer uv when available - much faster resolver and installer
+    uv = shutil.which("uv")
+    if uv:
+        command = [uv, "pip", "install", "--python", sys.executable, "-r", "requirements.txt"]
+    else:
+        # Upgrade pip and install requirements in a single pip invocation
+        command = [sys.executable, "-m", "pip", "install", "--upgrade", "pip", "-r", "requirements.txt"]
     
-    return True
+    return run_command(command, "Installing requirements")
 
 def install_spacy_model():
     """Install spaCy model"""
     print("🧠 Installing spaCy model...")
-    return run_command("python -m spacy download en_core_web_sm", "Installing spaCy model")
+    return run_command([sys.executable, "-m", "spacy", "download", "en_core_web_sm"], "Installing spaCy model")
 
-def create_directories():
+def create_directories(log=print):
     """Create necessary directories"""
-    print("📁 Creating directories...")
+    log("📁 Creating directories...")
     
     directories = [
         'uploads',
@@ -65,13 +66,13 @@ def create_directories():
     
     for directory in directories:
         Path(directory).mkdir(exist_ok=True)
-        print(f"✅ Created directory: {directory}")
+        log(f"✅ Created directory: {directory}")
     
     return True
 
-def create_env_file():
+def create_env_file(log=print):
     """Create .env file with default configuration"""
-    print("⚙️ Creating environment configuration...")
+    log("⚙️ Creating environment configuration...")
     
     env_content = """# Smart Resume Matcher Environment Configuration
 
@@ -89,29 +90,33 @@ LOG_LEVEL=INFO
 RATE_LIMIT_PER_HOUR=100
 """
     
-    with open('.env', 'w') as f:
-        f.write(env_content)
+    Path('.env').write_bytes(env_content.encode('utf-8'))
     
-    print("✅ Created .env file with default configuration")
+    log("✅ Created .env file with default configuration")
     return True
 
-def test_installation():
-    """Test the installation"""
+def test_installation(full=False):
+    """Test the installation (full=True also imports spaCy and loads the model)"""
     print("🧪 Testing installation...")
     
+    # Check packages are installed without importing them (torch alone takes seconds)
+    required_modules = [
+        'flask', 'sqlalchemy', 'spacy', 'sentence_transformers',
+        'sklearn', 'pandas', 'numpy', 'en_core_web_sm'
+    ]
+    missing = [module for module in required_modules if find_spec(module) is None]
+    if missing:
+        print(f"❌ Missing packages: {', '.join(missing)}")
+        return False
+    
+    print("✅ All required packages are installed")
+    
+    if not full:
+        return True
+    
     try:
-        # Test imports
-        import flask
-        import sqlalchemy
-        import spacy
-        import sentence_transformers
-        import sklearn
-        import pandas
-        import numpy
-        
-        print("✅ All required packages imported successfully")
-        
         # Test spaCy model
+        import spacy
         nlp = spacy.load("en_core_web_sm")
         doc = nlp("This is a test sentence.")
         print("✅ spaCy model loaded successfully")
@@ -125,9 +130,9 @@ def test_installation():
         print(f"❌ Test failed: {e}")
         return False
 
-def create_sample_data():
+def create_sample_data(log=print):
     """Create sample data for testing"""
-    print("📊 Creating sample data...")
+    log("📊 Creating sample data...")
     
     # Create sample resume
     sample_resume = """John Doe
@@ -157,10 +162,9 @@ SKILLS:
 Python, JavaScript, React, Node.js, AWS, Docker, Kubernetes, SQL, MongoDB, Git, Agile, Scrum
 """
     
-    with open('sample_resume.txt', 'w') as f:
-        f.write(sample_resume)
+    Path('sample_resume.txt').write_bytes(sample_resume.encode('utf-8'))
     
-    print("✅ Created sample resume file: sample_resume.txt")
+    log("✅ Created sample resume file: sample_resume.txt")
     return True
 
 def print_next_steps():
@@ -198,30 +202,34 @@ def main():
     if not check_python_version():
         sys.exit(1)
     
-    # Create directories
-    if not create_directories():
-        sys.exit(1)
-    
     # Install dependencies
     if not install_dependencies():
         print("❌ Failed to install dependencies. Please check the error messages above.")
         sys.exit(1)
     
-    # Install spaCy model
-    if not install_spacy_model():
+    # Download the spaCy model while the local files are created. The download
+    # streams to the terminal, so the file steps' messages are held until it ends.
+    file_messages = {step: [] for step in (create_directories, create_env_file, create_sample_data)}
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        spacy_future = executor.submit(install_spacy_model)
+        file_futures = [
+            executor.submit(step, log=messages.append)
+            for step, messages in file_messages.items()
+        ]
+    
+    for messages in file_messages.values():
+        for message in messages:
+            print(message)
+    
+    if not spacy_future.result():
         print("❌ Failed to install spaCy model. Please check the error messages above.")
         sys.exit(1)
     
-    # Create environment file
-    if not create_env_file():
-        sys.exit(1)
-    
-    # Create sample data
-    if not create_sample_data():
+    if not all(future.result() for future in file_futures):
         sys.exit(1)
     
-    # Test installation
-    if not test_installation():
+    # Test installation (pass --full to also load the spaCy model)
+    if not test_installation(full='--full' in sys.argv[1:]):
         print("❌ Installation test failed. Please check the error messages above.")
         sys.exit(1)
     